@@ -1,25 +1,29 @@
-from itertools import product
+import random
+from itertools import accumulate
 from typing import List
 
 import albumentations as A
+from albumentations.augmentations.geometric import functional as fgeometric
 import cv2
 import numpy as np
-import simpoly
-import toolz
 from PIL import Image
 
-from megane.data import Sample
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+from megane.data import PolygonList, Sample
 
 from megane.augment.aug_bloom import BloomFilter
 from megane.augment.aug_chromatic_aberration import ChromaticAberration
 from megane.augment.aug_fakelight import FakeLight
 
 
-def rgb_range(step=10):
-    r = range(0, 255, step)
-    g = range(0, 255, step)
-    b = range(0, 255, step)
-    return product(r, g, b)
+def random_rgb(step=10):
+    # Uniform over the grid range(0, 255, step) for each channel
+    n = 254 // step
+    return tuple(step * random.randint(0, n) for _ in range(3))
 
 
 def CoarseDropout(*a, **kw):
@@ -28,6 +32,112 @@ def CoarseDropout(*a, **kw):
     return patched
 
 
+class RandomFillPerspective(A.Perspective):
+    """`A.Perspective` with the padding color drawn on every call."""
+
+    def get_params(self):
+        return {**super().get_params(), "fill": random_rgb(10)}
+
+    def apply(
+        self, img, matrix=None, max_height=None, max_width=None, fill=0, **params
+    ):
+        return fgeometric.perspective(
+            img,
+            matrix,
+            max_width,
+            max_height,
+            fill,
+            self.pad_mode,
+            self.keep_size,
+            params["interpolation"],
+        )
+
+
+class RandomFillAffine(A.Affine):
+    """`A.Affine` with the padding color drawn on every call."""
+
+    def get_params(self):
+        return {**super().get_params(), "fill": random_rgb(10)}
+
+    def apply(self, img, matrix=None, output_shape=(), fill=0, **params):
+        return fgeometric.warp_affine(
+            img,
+            matrix,
+            interpolation=self.interpolation,
+            cval=fill,
+            mode=self.mode,
+            output_shape=output_shape,
+        )
+
+
+class FastOneOf(A.OneOf):
+    """Drop-in `A.OneOf` that picks the child with one `random.choices` over
+    cumulative weights cached at init, instead of `np.random.choice`
+    rebuilding the probability table on every call.
+    """
+
+    def __init__(self, transforms, p: float = 0.5):
+        super().__init__(transforms, p)
+        self.cum_weights = list(accumulate(self.transforms_ps))
+
+    def __call__(self, *args, force_apply: bool = False, **data):
+        if self.replay_mode:
+            return super().__call__(*args, force_apply=force_apply, **data)
+
+        if self.transforms_ps and (force_apply or random.random() < self.p):
+            t = random.choices(self.transforms, cum_weights=self.cum_weights)[0]
+            data = t(force_apply=True, **data)
+        return data
+
+
+def _regroup_keypoints_numpy(masks, xy, num_boxes):
+    order = np.argsort(masks, kind="stable")
+    edges = np.searchsorted(masks[order], np.arange(num_boxes + 1))
+    return xy[order], edges
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _regroup_keypoints_numba(masks, xy, num_boxes):
+        # Counting sort, masks are in [0, num_boxes)
+        counts = np.zeros(num_boxes, dtype=np.int64)
+        for m in masks:
+            counts[m] += 1
+        edges = np.zeros(num_boxes + 1, dtype=np.int64)
+        edges[1:] = np.cumsum(counts)
+
+        out = np.empty_like(xy)
+        cursor = edges[:-1].copy()
+        for i in range(len(masks)):
+            m = masks[i]
+            out[cursor[m]] = xy[i]
+            cursor[m] += 1
+        return out, edges
+
+
+def regroup_keypoints(masks, xy, num_boxes: int):
+    """
+    Bucket keypoints by the index of the box they belong to.
+
+    Args:
+        masks (np.ndarray):
+            Integer array of shape [N], the box index of each keypoint.
+        xy (np.ndarray):
+            Keypoints array of shape [N, 2].
+        num_boxes (int):
+            Number of boxes.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]:
+            The keypoints sorted by box and the bucket edges of shape
+            [num_boxes + 1], `edges[i]:edges[i + 1]` is the range of box i.
+    """
+    if njit is None:
+        return _regroup_keypoints_numpy(masks, xy, num_boxes)
+    return _regroup_keypoints_numba(masks, xy, num_boxes)
+
+
 def idendity(**kw):
     return kw
 
@@ -49,19 +159,19 @@ def encode(sample: Sample):
         enc = encode(sample)
         transform(**enc)
     """
-    image = np.array(sample.image)
+    image = np.asarray(sample.image)
     classes = sample.classes
     boxes = sample.boxes
     h, w = image.shape[:2]
-    masks = []
-    keypoints = []
-    for i, polygon in enumerate(boxes):
-        polygon = simpoly.scale_to(polygon, w, h)
-        keypoints.extend(polygon)
-        masks.extend([i] * len(polygon))
+
+    # All the polygons as one keypoint array scaled to pixels,
+    # the masks map each keypoint back to its polygon
+    boxes = PolygonList.from_polygons(boxes)
+    keypoints = boxes.xy * np.array([w, h], dtype=np.float32)
+    masks = boxes.masks
 
     if len(masks) > 0:
-        assert max(masks) == len(classes) - 1
+        assert masks[-1] == len(classes) - 1
     else:
         assert len(classes) == 0
     return dict(image=image, keypoints=keypoints, box_mapping=masks, classes=classes)
@@ -91,14 +201,19 @@ def decode(outputs):
     masks = outputs["box_mapping"]
     xy = outputs["keypoints"]
 
+    # Bucket the keypoints by their box index,
+    # edges[i]:edges[i + 1] is the keypoint range of box i
+    masks = np.asarray(masks, dtype=np.int64)
+    xy = np.asarray(xy, dtype=np.float32).reshape(-1, 2)
+    xy, edges = regroup_keypoints(masks, xy, len(classes))
+    polygons = PolygonList(xy / np.array([w, h], dtype=np.float32), edges)
+
     # Conver keypoints to bounding boxes
-    groups = toolz.groupby(lambda i: i[1], enumerate(masks))
     out_classes = []
     boxes = []
-    for i, idx in groups.items():
-        box = simpoly.scale_from([xy[j] for j, _ in idx], w, h)
+    for i, box in enumerate(polygons):
         if len(box) > 2:
-            boxes.append(box)
+            boxes.append(box.tolist())
             out_classes.append(classes[i])
 
     # Correctness checking
@@ -117,20 +232,24 @@ def default_transform(
     rotate: bool = False,
     flip: bool = False,
     light_fx: bool = False,
+    photometric: bool = True,
     background_images: List[str] = [],
     domain_images: List[str] = [],
 ):
     transformations = [
         # Cropping related
-        A.OneOf(
+        FastOneOf(
             [
                 A.RandomCropFromBorders(),
                 A.CropAndPad(percent=(0.025, 0.25)),
             ],
             p=prob,
         ),
+    ]
+
+    if photometric:
         # Color effects
-        A.OneOf(
+        color_transform = FastOneOf(
             [
                 A.RandomBrightnessContrast(),
                 A.ToGray(),
@@ -144,12 +263,14 @@ def default_transform(
                 A.RGBShift(),
             ],
             p=prob,
-        ),
+        )
+        transformations.append(color_transform)
+
         # Degrade
-        A.OneOf(
+        degrade_transform = FastOneOf(
             [
                 A.PixelDropout(),
-                A.OneOf(
+                FastOneOf(
                     [
                         CoarseDropout(fill_value=color, max_width=32, max_height=32)
                         for color in range(0, 255)
@@ -166,14 +287,14 @@ def default_transform(
                 A.GaussNoise(),
             ],
             p=prob,
-        ),
-    ]
+        )
+        transformations.append(degrade_transform)
 
     if light_fx:
         # Lighting
-        transformations.append(A.OneOf([FakeLight()], p=prob))
+        transformations.append(FastOneOf([FakeLight()], p=prob))
         transformations.append(
-            A.OneOf(
+            FastOneOf(
                 [
                     A.RandomShadow(shadow_roi=(0, 0, 1, 1)),
                     A.RandomSunFlare(
@@ -191,7 +312,7 @@ def default_transform(
 
     if flip:
         # group: Flipping around
-        flip_transform = A.OneOf(
+        flip_transform = FastOneOf(
             [
                 A.RandomRotate90(p=prob),
                 A.VerticalFlip(p=prob),
@@ -203,30 +324,23 @@ def default_transform(
         # group: Geometric transform
 
     if rotate:
-        rotate_transform = A.OneOf(
+        rotate_transform = FastOneOf(
             [
-                *[
-                    A.Perspective(fit_output=True, pad_val=(r, g, b))
-                    for (r, g, b) in rgb_range(10)
-                ],
-                *[
-                    A.Affine(
-                        scale=(0.3, 1),
-                        rotate=(-180, 180),
-                        translate_percent=(0.2, 0.2),
-                        shear=(-30, 30),
-                        fit_output=True,
-                        cval=(r, g, b),
-                    )
-                    for (r, g, b) in rgb_range(10)
-                ],
+                RandomFillPerspective(fit_output=True),
+                RandomFillAffine(
+                    scale=(0.3, 1),
+                    rotate=(-180, 180),
+                    translate_percent=(0.2, 0.2),
+                    shear=(-30, 30),
+                    fit_output=True,
+                ),
             ],
             p=prob,
         )
         transformations.append(rotate_transform)
 
     if len(domain_images) > 0:
-        domain_transforms = A.OneOf(
+        domain_transforms = FastOneOf(
             [
                 A.FDA(domain_images, beta_limit=0.025),
                 A.HistogramMatching(domain_images),
@@ -3,7 +3,6 @@ from functools import partial
 from typing import Union, Tuple
 
 import cv2
-import numpy as np
 import albumentations as A
 
 
@@ -37,13 +36,14 @@ def bloom_filter(
     if isinstance(gain, (list, tuple)):
         gain = random.uniform(*gain)
 
-    # convert image to hsv colorspace as floats
-    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV).astype(np.float64)
+    # convert image to hsv colorspace
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
     h, s, v = cv2.split(hsv)
 
     # Desire low saturation and high brightness for white
-    # So invert saturation and multiply with brightness
-    sv = ((255 - s) * v / 255).clip(0, 255).astype(np.uint8)
+    # So invert saturation and multiply with brightness,
+    # both are saturated uint8 ops, no float intermediates
+    sv = cv2.multiply(cv2.bitwise_not(s), v, scale=1 / 255)
 
     # threshold
     thresh = cv2.threshold(sv, white_threshold, 255, cv2.THRESH_BINARY)[1]
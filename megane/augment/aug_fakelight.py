@@ -58,7 +58,7 @@ def fake_light(
         image = np.stack([image, image, image], axis=-1)
 
     # Tiles
-    canvas = np.zeros((H, W, 3))
+    canvas = np.zeros((H, W, 3), dtype=image.dtype)
     for x in range(0, W, tile_size):
         for y in range(0, H, tile_size):
             br = shader_fn(x, y, W, H)
@@ -66,8 +66,8 @@ def fake_light(
             y2 = min(y + tile_size, H)
             cv2.rectangle(canvas, (x, y), (x2, y2), br, -1)
 
-    # alpha composite
-    image = (image * (1 - alpha) + canvas * alpha).round().astype(image.dtype)
+    # alpha composite, fused and saturated in a single pass
+    image = cv2.addWeighted(image, 1 - alpha, canvas, alpha, 0)
     return image
 
 
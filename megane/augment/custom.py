@@ -17,8 +17,8 @@ def replace_background(image, background, polygons):
     polygons = [np.array(p) for p in polygons]
     mask = draw_mask(w, h, polygons).astype(bool)[:, :, None]
     mask = mask * blend
-    image = np.array(image)
-    background = np.array(background.resize((w, h)).convert("RGB"))
+    image = np.asarray(image)
+    background = np.asarray(background.resize((w, h)).convert("RGB"))
     image = image * mask + (1 - mask) * background
     image = image.astype("uint8")
     return Image.fromarray(image)
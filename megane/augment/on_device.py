@@ -0,0 +1,43 @@
+import torch
+from kornia import augmentation as K
+
+
+class DeviceAugmentation:
+    """Reduced photometric augmentation that runs on batched image tensors,
+    after the batch is collated and moved to the training device.
+
+    It is used instead of the color and degrade groups of the CPU
+    `Augmentation`, but only covers part of them: color jitter, grayscale,
+    gaussian noise, gaussian blur and salt-and-pepper noise. JPEG compression,
+    downscale, coarse/pixel dropout, posterize, equalize, channel shuffle,
+    spatter, ISO noise and the other color effects have no counterpart here.
+
+    Only pixel-value transformations are used here, the targets are encoded
+    per sample on the workers, so geometric transforms stay in `Augmentation`.
+
+    Each transformation is drawn independently for every sample. The
+    probability is split within each group, so the rate at which a group
+    fires stays close to the `OneOf` groups it stands in for.
+
+    Args:
+        prob:
+            Probability of applying each group of transformations.
+    """
+
+    def __init__(self, prob=0.33333):
+        color_p = prob / 2
+        degrade_p = prob / 3
+        self.transform = K.AugmentationSequential(
+            # Color effects
+            K.ColorJitter(0.2, 0.2, 0.2, 0.05, p=color_p),
+            K.RandomGrayscale(p=color_p),
+            # Degrade
+            K.RandomGaussianNoise(std=0.03, p=degrade_p),
+            K.RandomGaussianBlur((5, 5), (0.1, 2.0), p=degrade_p),
+            K.RandomSaltAndPepperNoise(amount=(0.01, 0.06), p=degrade_p),
+        )
+
+    @torch.no_grad()
+    def __call__(self, images: torch.Tensor) -> torch.Tensor:
+        images = self.transform(images)
+        return images.clamp_(0, 1)
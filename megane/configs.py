@@ -47,6 +47,11 @@ class AugmentConfig(BaseModel):
             List of domain images for augmentation. Defaults to an empty list.
         prob (float):
             Probability of applying augmentation.
+        on_device (bool):
+            Replace the color and degrade groups with a reduced set of
+            photometric transformations, applied to the collated batch on
+            the training device instead of in the dataloader workers.
+            Requires `kornia`. Defaults to False.
 
     Example:
         config = AugmentConfig(
@@ -60,6 +65,7 @@ class AugmentConfig(BaseModel):
     background_index: str = None
     domain_index: str = None
     prob: float = 0.3333
+    on_device: bool = False
 
     @property
     def domain_images(self):
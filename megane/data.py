@@ -14,6 +14,58 @@ from pyrsistent import pvector
 from megane import utils
 
 
+class PolygonList:
+    """A list of polygons stored as a structure of arrays.
+
+    All the vertices are kept in one contiguous array, indexing returns
+    views into it, so the whole list can be transformed with array ops.
+
+    Attributes:
+        xy:
+            Float32 array of shape [P, 2], the vertices of every polygon.
+        offsets:
+            Int64 array of shape [N + 1], polygon `i` is
+            `xy[offsets[i] : offsets[i + 1]]`.
+    """
+
+    def __init__(self, xy, offsets):
+        self.xy = np.asarray(xy, dtype="float32").reshape(-1, 2)
+        self.offsets = np.asarray(offsets, dtype="int64")
+        assert self.offsets[0] == 0 and self.offsets[-1] == len(self.xy)
+
+    @classmethod
+    def from_polygons(cls, polygons):
+        """Pack polygons (lists of (x, y) points) into a `PolygonList`.
+        Returns the input if it is already a `PolygonList`."""
+        if isinstance(polygons, PolygonList):
+            return polygons
+        sizes = [len(polygon) for polygon in polygons]
+        offsets = np.zeros(len(sizes) + 1, dtype="int64")
+        offsets[1:] = np.cumsum(sizes)
+        if len(sizes) == 0:
+            return cls(np.zeros((0, 2)), offsets)
+        xy = np.concatenate([np.asarray(p, dtype="float32") for p in polygons])
+        return cls(xy, offsets)
+
+    @property
+    def masks(self) -> np.ndarray:
+        """The polygon index of each vertex, shape [P]."""
+        return np.repeat(np.arange(len(self)), np.diff(self.offsets))
+
+    def tolist(self) -> List[List[Tuple[float, float]]]:
+        return [polygon.tolist() for polygon in self]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.xy[self.offsets[i] : self.offsets[i + 1]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
 @dataclass
 class Sample:
     """One text detection train data sample
@@ -36,8 +88,11 @@ class Sample:
     scores: Optional[pvector] = None
 
     def __post_init__(self):
-        # Validate
-        self.image = self.image.convert("RGB")
+        # Validate, convert() always copies so skip it for RGB images
+        if self.image.mode == "RGB":
+            self.image.load()
+        else:
+            self.image = self.image.convert("RGB")
         for box in self.boxes:
             box = np.array(box)
             assert (
@@ -107,7 +162,7 @@ def load_sample_labelme(sample_path, classes, single_class: bool):
         image = utils.bytes2pillow(b64decode(image_data))
     else:
         image_path = path.join(path.dirname(sample_path), image_path)
-        image = Image.open(image_path)
+        image = utils.load_image(image_path)
 
     width, height = image.size
 
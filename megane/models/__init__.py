@@ -1,6 +1,5 @@
 import torch
 from torch import Tensor, nn
-from torchvision import transforms as T
 
 from megane.models import (
     backbone_vit,
@@ -11,6 +10,7 @@ from megane.models import (
     head_segm,
     tablenet,
 )
+from megane.models.utils import Normalize
 from megane.utils import init_from_ns
 from megane.registry import backbones, heads
 
@@ -20,7 +20,7 @@ class Model(nn.Module):
         super().__init__()
 
         # Backbone
-        self.preprocess = T.Normalize(
+        self.preprocess = Normalize(
             mean=[0.485, 0.456, 0.406],
             std=[0.229, 0.224, 0.225],
         )
@@ -27,6 +27,28 @@ class MultiscaleConv(nn.Module):
         return torch.cat(features, dim=1)
 
 
+class Normalize(nn.Module):
+    """Channel-wise normalization `(image - mean) / std`, computed as a single
+    fused `image * (1 / std) + (-mean / std)` pass without cloning the input.
+
+    Args:
+        mean:
+            Per channel mean.
+        std:
+            Per channel standard deviation.
+    """
+
+    def __init__(self, mean, std):
+        super().__init__()
+        mean = torch.tensor(mean, dtype=torch.float32).reshape(-1, 1, 1)
+        std = torch.tensor(std, dtype=torch.float32).reshape(-1, 1, 1)
+        self.register_buffer("scale", 1 / std, persistent=False)
+        self.register_buffer("shift", -mean / std, persistent=False)
+
+    def forward(self, images):
+        return torch.addcmul(self.shift, images, self.scale)
+
+
 def Chain(*alayers, **klayers):
     modules = OrderedDict()
     for i, layer in enumerate(alayers):
@@ -7,12 +7,23 @@ from megane.models import Model
 from megane.utils import prepare_input
 
 
+def load_state_dict(weight_path: str):
+    """Load a state dict, memory-mapped if the checkpoint supports it.
+
+    Memory mapping keeps the tensors in file-backed pages until they are
+    copied into the model, legacy (non-zipfile) checkpoints cannot be
+    mapped and are loaded normally.
+    """
+    try:
+        return torch.load(weight_path, map_location="cpu", mmap=True, weights_only=True)
+    except RuntimeError:
+        return torch.load(weight_path, map_location="cpu", weights_only=True)
+
+
 class Predictor:
     def __init__(self, model_config: ModelConfig):
         self.model = Model(model_config)
-        self.model.load_state_dict(
-            torch.load(model_config.inference_weight, map_location="cpu")
-        )
+        self.model.load_state_dict(load_state_dict(model_config.inference_weight))
         self.image_size = model_config.image_size
 
     def predict(self, image: Image) -> Sample:
@@ -19,12 +19,12 @@ With this, some weird problem arise though.
 from dataclasses import dataclass
 from typing import Tuple
 
-import simpoly
+import numpy as np
 from PIL import Image
 from lenses import bind
 
 from megane.registry import processors
-from megane.data import Sample
+from megane.data import PolygonList, Sample
 from megane.utils import init_from_ns
 
 
@@ -60,13 +60,12 @@ class Letterbox:
         resized = image.resize((new_width, new_height))
         final.paste(resized, (pad_width, pad_height))
 
-        # Bounding box letterboxing
-        new_boxes = []
-        for box in boxes:
-            box = simpoly.scale_to(box, new_width, new_height)
-            box = [(x + pad_width, y + pad_height) for (x, y) in box]
-            box = simpoly.scale_from(box, width, height)
-            new_boxes.append(box)
+        # Bounding box letterboxing, every point of every box
+        # is mapped with a single float32 multiply-add
+        scale = np.array([[new_width / width, new_height / height]], dtype="float32")
+        shift = np.array([[pad_width / width, pad_height / height]], dtype="float32")
+        boxes = PolygonList.from_polygons(boxes)
+        new_boxes = PolygonList(boxes.xy * scale + shift, boxes.offsets).tolist()
 
         # Create new sample
         sample = bind(sample).image.set(final)
@@ -94,7 +94,7 @@ def init_model(config: MeganeConfig, force_weights: bool = False):
             print("Weight {weight} not found, skipping loading it")
             continue
 
-        weight = torch.load(weight, map_location="cpu")
+        weight = torch.load(weight, map_location="cpu", weights_only=True)
         load_weights(model, weight)
         loaded_weight = True
 
@@ -149,8 +149,17 @@ class Trainer:
                 prob=augment.prob,
                 background_images=augment.background_images,
                 domain_images=augment.domain_images,
+                photometric=not augment.on_device,
             )
 
+        # Batched augmentation on the training device
+        if augment_enabled and augment.on_device:
+            from megane.augment.on_device import DeviceAugmentation
+
+            self.device_augment = DeviceAugmentation(prob=augment.prob)
+        else:
+            self.device_augment = None
+
         def make_loader(data, augment: bool, **kwargs):
             # Transform function
             def transform(sample):
@@ -207,6 +216,8 @@ class Trainer:
         pbar = tqdm(pbar, "Training", total=total_steps)
         for step, (images, targets) in pbar:
             optimizer.zero_grad()
+            if self.device_augment is not None:
+                images = self.device_augment(images)
             if random.choice((True, False)):
                 images = generate_fgsm_example(model, images, targets)
 
@@ -3,7 +3,7 @@ from typing import Dict
 import cv2
 import numpy as np
 
-from megane.utils.image import prepare_input
+from megane.utils.image import prepare_input, load_image
 from megane.utils.masks import *
 from megane.utils.meanap import *
 from megane.utils.misc import (
@@ -17,6 +17,7 @@ from megane.utils.polygons import *
 from megane.utils.convert import *
 
 assert prepare_input
+assert load_image
 
 try:
     from megane.utils.torch import stack_image_batch
@@ -1,6 +1,11 @@
 import numpy as np
 from PIL import Image
 
+try:
+    import pyvips
+except ImportError:
+    pyvips = None
+
 
 def letterbox(
     image: Image,
@@ -51,6 +56,38 @@ def letterbox(
     return letterboxed_image
 
 
+def load_image(image_path: str) -> Image:
+    """
+    Load an image file as a Pillow image.
+
+    If `pyvips` is installed, 8-bit RGB, grayscale and palette images are
+    decoded by libvips in sequential access mode, which is faster than Pillow
+    for large images, and returned as RGB. Other images (CMYK, 16-bit, ...)
+    are converted differently by libvips than by Pillow, so they and every
+    image without `pyvips` fall back to `Image.open`.
+
+    Args:
+        image_path (str): Path to the image file.
+
+    Returns:
+        Image: The loaded Pillow image.
+    """
+    if pyvips is None:
+        return Image.open(image_path)
+
+    image = pyvips.Image.new_from_file(image_path, access="sequential")
+    if image.format != "uchar" or image.interpretation not in ("srgb", "b-w"):
+        return Image.open(image_path)
+
+    image = image.colourspace("srgb")
+    if image.bands > 3:
+        image = image.extract_band(0, n=3)
+    buffer = image.write_to_memory()
+    array = np.frombuffer(buffer, dtype=np.uint8)
+    array = array.reshape(image.height, image.width, 3)
+    return Image.fromarray(array)
+
+
 def pillow_to_numpy(image: Image) -> np.ndarray:
     """
     Converts a PIL Image object to a RGB numpy array with CHW format.
@@ -61,8 +98,8 @@ def pillow_to_numpy(image: Image) -> np.ndarray:
     Returns:
         np.ndarray: The numpy array representation of the image.
     """
-    img = np.array(image.convert("RGB"), dtype="float32")
-    img = img / 255
+    img = np.asarray(image.convert("RGB"), dtype="float32")
+    img /= 255
     h, w, c = 0, 1, 2
     img = img.transpose(c, h, w)
     return img
@@ -97,10 +134,14 @@ def prepare_input(
         image = image.resize((image_width, image_height))
     elif resize_mode == "letterbox":
         image = letterbox(image, image_width, image_height)
-    image = np.array(image)
-    image = image.astype("float32") / 255
+    image = np.asarray(image, dtype="float32")
+
+    # Scale (and shift) in place on the one float copy
+    if center_value:
+        image *= 2 / 255
+        image -= 1
+    else:
+        image /= 255
     h, w, c = 0, 1, 2
     image = image.transpose([c, h, w])
-    if center_value:
-        image = image * 2 - 1
     return image